@@ -1,14 +1,25 @@
 # daily_academic_report.py
 import os
 import re
+import csv
+import json
+import time
+import hashlib
+import sqlite3
+from contextlib import closing
 from datetime import datetime, timedelta, timezone
 from concurrent.futures import ThreadPoolExecutor
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, TYPE_CHECKING
 
-import yaml
+import numpy as np
 import pandas as pd
 from dotenv import load_dotenv
-from openai import OpenAI
+
+# openai / yaml / pyarrow 导入较慢，放到真正用到的函数里再导入，
+# 这样没有数据、提前结束的运行能更快退出
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 # 加载 .env 中的 DEEPSEEK_API_KEY、EMAIL_*
 load_dotenv()
@@ -17,12 +28,38 @@ RAW_DIR = "data/raw"                # ← 现在只从这里读取最新原始
 SETTINGS_PATH = "config/settings.yaml"
 REPORT_DIR = "data/reports"
 SEEN_PATH = "data/seen_items.csv"   # ← 已见条目列表
+CACHE_PATH = "data/deepseek_cache.sqlite"  # ← DeepSeek 打分 / 翻译结果缓存（不进仓库）
+
+# DeepSeek 请求失败时的最大重试次数（openai SDK 默认 2 次）：SDK 只对连接错误 / 408 / 409 / 429 / 5xx 重试，
+# 400 这类永久错误不重试；重试间隔为带随机抖动的指数退避（0.5s 起，最长 8s，遵守 Retry-After）。
+# 批量打分后一次失败会丢掉 batch_size 条的分数，所以多给两次机会；4 次重试的退避总计约 7.5s，
+# 而请求数已比逐条打分少了约 batch_size 倍，最坏情况下的总重试流量仍低于原先逐条打分
+DEEPSEEK_MAX_RETRIES = 4
+
+# 原始 CSV 中下游实际会用到的列及其类型，其余列不读入
+RAW_DTYPES = {
+    "feed_id": "category",
+    "feed_name": "category",
+    "title": str,
+    "link": str,
+    "summary": str,
+    "published": str,   # RSS 时间格式五花八门，读入时不解析；选候选时再解析，报告显示解析后的 UTC 时间
+    "doi": str,
+    "DOI": str,
+}
+RAW_DATE_COLUMNS = ["fetched_at"]  # fetch_feeds.py 写入的 ISO 8601 时间
+
+# 解析 DeepSeek 回复用的正则，模块加载时编译一次
+_DIGITS_RE = re.compile(r"\d+")
+_JSON_ARRAY_RE = re.compile(r"\[.*?\]", re.S)
 
 # ======================
 # 基础配置与工具函数
 # ======================
 
 def load_settings():
+    import yaml
+
     with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
         return yaml.safe_load(f) or {}
 
@@ -32,12 +69,10 @@ def get_recent_data(df: pd.DataFrame, days_window: int) -> pd.DataFrame:
     取最近 days_window 天内的文章（按 published / fetched_at）。
     当前版本 main 里没有使用该函数，如果以后想再加时间窗口过滤可以重用。
     """
-    df = df.copy()
-    for col in ["published", "fetched_at"]:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors="coerce", utc=True)
+    published = pd.to_datetime(df["published"], errors="coerce", utc=True)
+    fetched_at = pd.to_datetime(df["fetched_at"], errors="coerce", utc=True)
 
-    ts = df["published"].fillna(df["fetched_at"])
+    ts = published.fillna(fetched_at)
     cutoff = datetime.now(timezone.utc) - timedelta(days=days_window)
     return df[ts >= cutoff]
 
@@ -52,79 +87,148 @@ def load_latest_raw() -> Optional[pd.DataFrame]:
         return None
 
     # 只考虑 .csv 文件；如果你有别的格式（如 .parquet），可以在这里扩展
-    candidates = []
-    for name in os.listdir(RAW_DIR):
-        if name.lower().endswith(".csv"):
-            full = os.path.join(RAW_DIR, name)
-            if os.path.isfile(full):
-                candidates.append(full)
+    # os.scandir 一次遍历即可拿到文件类型和 stat 信息，不必对每个文件再单独 stat
+    with os.scandir(RAW_DIR) as it:
+        candidates = [
+            entry for entry in it
+            if entry.name.lower().endswith(".csv") and entry.is_file()
+        ]
 
     if not candidates:
         print(f"[错误] data/raw 目录下没有找到任何 CSV 文件：{RAW_DIR}")
         return None
 
     # 按最后修改时间选最新的文件
-    latest_path = max(candidates, key=os.path.getmtime)
+    latest_path = max(candidates, key=lambda entry: entry.stat().st_mtime).path
     print(f"[信息] 正在读取最新原始数据文件：{latest_path}")
 
     try:
-        df = pd.read_csv(latest_path)
-        return df
+        df = pd.read_csv(
+            latest_path,
+            usecols=lambda c: c in RAW_DTYPES or c in RAW_DATE_COLUMNS,
+            dtype=RAW_DTYPES,
+            parse_dates=RAW_DATE_COLUMNS,
+            date_format="ISO8601",
+        )
+        return normalize_raw(df)
     except Exception as e:
         print(f"[错误] 读取最新原始文件失败：{e}")
         return None
 
 
+def normalize_raw(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    读入后统一整理一次：
+    - doi / DOI 两列合并成一列 doi（doi 优先），去掉 DOI；
+    - 文本列缺失时补成空列，空值统一填成 ""。
+    这样下游逐条处理时不必再写 `or ""` / DOI 兜底。
+    """
+    if "DOI" in df.columns:
+        doi = df["doi"].combine_first(df["DOI"]) if "doi" in df.columns else df["DOI"]
+        df = df.drop(columns=["DOI"]).assign(doi=doi)
+
+    for col in RAW_DTYPES:
+        if col == "DOI":
+            continue
+        if col not in df.columns:
+            df[col] = ""
+            continue
+        values = df[col]
+        if isinstance(values.dtype, pd.CategoricalDtype) and "" not in values.cat.categories:
+            values = values.cat.add_categories("")
+        df[col] = values.fillna("")
+    return df
+
+
 # =======================
 # baseline / 新增条目记录
 # =======================
 
-def load_seen_keys() -> Optional[set]:
+def _make_keys(df: pd.DataFrame) -> pd.Series:
     """
-    从 SEEN_PATH 读取已经见过的条目 key 集合。
+    向量化地为 df 每一行构造条目 key：feed_id + '||' + link。
+    缺失的列 / 空值按空字符串处理。
+    """
+    def _col(name: str) -> pd.Series:
+        if name not in df.columns:
+            return pd.Series("", index=df.index, dtype="string")
+        return df[name].astype("string").fillna("")
+
+    return (_col("feed_id") + "||" + _col("link")).astype(str)
+
+
+def load_seen_keys() -> Optional[pd.Index]:
+    """
+    从 SEEN_PATH 读取已经见过的条目 key，返回 pd.Index（成员判断走 C 哈希表）。
     key 的设计：feed_id + '||' + link。
     如果文件不存在，返回 None，表示首次运行（baseline 模式）。
     """
     if not os.path.exists(SEEN_PATH):
         return None
 
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+
     try:
-        df_seen = pd.read_csv(SEEN_PATH)
-        if "key" not in df_seen.columns:
+        # pyarrow 的 CSV 解析在 C++ 里多线程完成，比 pandas 默认解析器快得多
+        tbl = pacsv.read_csv(
+            SEEN_PATH,
+            read_options=pacsv.ReadOptions(use_threads=True),
+            convert_options=pacsv.ConvertOptions(column_types={"key": pa.string()}),
+        )
+        if "key" not in tbl.column_names:
             return None
-        keys = set(df_seen["key"].astype(str).tolist())
+        keys = pd.Index(tbl.column("key").to_numpy(), dtype=object)
         return keys
     except Exception as e:
         print(f"[警告] 读取已见列表 {SEEN_PATH} 失败，将视为首次运行: {e}")
         return None
 
 
-def update_seen_keys(df: pd.DataFrame):
+def _write_seen_keys(keys: pd.Series, fresh: bool):
     """
-    把当前 df 里的所有条目 key 写入 SEEN_PATH（追加去重）。
+    把 keys（去重后）写入 SEEN_PATH。
+    fresh=True 时重建文件并写表头；否则只在文件末尾追加。
     """
     os.makedirs(os.path.dirname(SEEN_PATH), exist_ok=True)
 
-    if df.empty:
+    keys = keys.drop_duplicates()
+    if keys.empty and not fresh:
         return
 
-    keys = df.apply(
-        lambda r: f"{r.get('feed_id', '')}||{r.get('link', '')}",
-        axis=1,
-    ).astype(str)
+    # 直接用 csv 模块写出，不为单列 key 再构造一个 DataFrame；
+    # 固定 "\n" 换行，避免在 Windows 上写出 "\r\n" 污染仓库里的文件
+    with open(SEEN_PATH, "w" if fresh else "a", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL, lineterminator="\n")
+        if fresh:
+            writer.writerow(["key"])
+        writer.writerows([k] for k in keys)
 
-    df_new = pd.DataFrame({"key": keys}).drop_duplicates()
 
-    if os.path.exists(SEEN_PATH):
-        try:
-            df_old = pd.read_csv(SEEN_PATH)
-        except Exception:
-            df_old = pd.DataFrame(columns=["key"])
-        df_all = pd.concat([df_old, df_new], ignore_index=True).drop_duplicates()
-    else:
-        df_all = df_new
+def update_seen_keys(
+    df: pd.DataFrame,
+    seen_keys: Optional[pd.Index] = None,
+    keys: Optional[pd.Series] = None,
+):
+    """
+    把当前 df 里尚未记录过的条目 key 追加写入 SEEN_PATH。
+    只写增量，不再整体读入 + 去重 + 重写整个文件。
+    seen_keys：调用方已经读入的已见 key；传入时不再重复读盘。
+    keys：调用方已经用 _make_keys(df) 算好的 key；传入时不再重新构造。
+    """
+    if df.empty:
+        return
 
-    df_all.to_csv(SEEN_PATH, index=False)
+    if keys is None:
+        keys = _make_keys(df)
+
+    if seen_keys is None:
+        seen_keys = load_seen_keys()
+    if seen_keys is None:
+        # 文件不存在或无法解析：重新建立
+        _write_seen_keys(keys, fresh=True)
+    else:
+        _write_seen_keys(keys[~keys.isin(seen_keys)], fresh=False)
 
 
 def filter_new_items(recent_df: pd.DataFrame):
@@ -140,60 +244,143 @@ def filter_new_items(recent_df: pd.DataFrame):
 
     # 第一次运行：建立 baseline，但本次也推送所有当前条目
     if seen_keys is None:
-        update_seen_keys(recent_df)
+        if not recent_df.empty:
+            _write_seen_keys(_make_keys(recent_df), fresh=True)
         print("[信息] 首次运行：已记录当前所有条目作为 baseline，本次会推送全部当前条目，以后只推新增。\n")
         return recent_df, True
 
     if recent_df.empty:
         return recent_df, False
 
-    tmp = recent_df.copy()
-    tmp["_key"] = tmp.apply(
-        lambda r: f"{r.get('feed_id', '')}||{r.get('link', '')}",
-        axis=1,
-    ).astype(str)
+    keys = _make_keys(recent_df)
+    mask_new = ~keys.isin(seen_keys)
+    new_df = recent_df[mask_new]
 
-    mask_new = ~tmp["_key"].isin(seen_keys)
-    new_df = tmp[mask_new].drop(columns=["_key"])
-
-    # 无论是否有新增，都更新一下已见列表（把今天看到的都记上）
-    update_seen_keys(recent_df)
+    # 把今天新看到的条目记进已见列表：复用上面读入的 seen_keys 和算好的 key，
+    # 不再重新读盘、重新构造 key
+    update_seen_keys(recent_df, seen_keys, keys=keys)
 
     return new_df, False
 
 
+# =======================
+#   DeepSeek 结果缓存（sqlite）
+# =======================
+
+# 缓存表名 -> 存放结果的列名
+_CACHE_TABLES = {"scores": "score", "translations": "zh"}
+
+
+def open_cache() -> Optional[sqlite3.Connection]:
+    """
+    打开（必要时创建）CACHE_PATH 下的 sqlite 缓存，包含打分表和翻译表。
+    打开失败时返回 None，本次运行不使用缓存。
+    """
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        conn = sqlite3.connect(CACHE_PATH)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, score REAL, ts INTEGER)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, zh TEXT, ts INTEGER)"
+        )
+        return conn
+    except sqlite3.Error as e:
+        print(f"[警告] 打开缓存 {CACHE_PATH} 失败，本次不使用缓存: {e}")
+        return None
+
+
+def _hash_key(*parts) -> str:
+    raw = "\x1f".join(str(p) for p in parts)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def score_cache_key(user_profile: str, item: dict) -> str:
+    """
+    打分缓存的 key：sha256(user_profile || title || summary)。
+    画像改了，旧分数自然失效。
+    """
+    title = item.get("title", "")
+    summary = item.get("summary", "")
+    return _hash_key(user_profile, title, summary)
+
+
+def cache_get(conn: sqlite3.Connection, table: str, keys: list) -> dict:
+    """
+    批量查询缓存表 table，返回 {key: value}（只包含命中的 key）。
+    """
+    column = _CACHE_TABLES[table]
+    found = {}
+    unique_keys = list(dict.fromkeys(keys))
+    try:
+        # 分块查询，避免超过 sqlite 的参数个数上限
+        for i in range(0, len(unique_keys), 500):
+            chunk = unique_keys[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT key, {column} FROM {table} WHERE key IN ({placeholders})", chunk
+            ).fetchall()
+            found.update(rows)
+    except sqlite3.Error as e:
+        print(f"[警告] 读取缓存表 {table} 失败，将全部重新请求: {e}")
+    return found
+
+
+def cache_put(conn: sqlite3.Connection, table: str, values: dict):
+    """
+    把 {key: value} 写入缓存表 table（已存在则覆盖）。
+    """
+    if not values:
+        return
+    column = _CACHE_TABLES[table]
+    now_ts = int(time.time())
+    try:
+        with conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {table} (key, {column}, ts) VALUES (?, ?, ?)",
+                [(k, v, now_ts) for k, v in values.items()],
+            )
+    except sqlite3.Error as e:
+        print(f"[警告] 写入缓存表 {table} 失败: {e}")
+
+
 # =======================
 #   DeepSeek 客户端 & 打分/翻译
 # =======================
 
-def get_deepseek_client() -> Optional[OpenAI]:
+@lru_cache(maxsize=None)
+def get_deepseek_client() -> Optional["OpenAI"]:
     """
     初始化 DeepSeek 客户端。
     需要环境变量 DEEPSEEK_API_KEY。
+    整个进程只创建一个客户端，打分和翻译两个阶段共用它（及 SDK 自带的连接池）。
     """
     api_key = os.environ.get("DEEPSEEK_API_KEY")
     if not api_key:
         print("[警告] 未检测到环境变量 DEEPSEEK_API_KEY，跳过个性化推荐/翻译部分。")
         return None
 
+    from openai import OpenAI
+
     client = OpenAI(
         api_key=api_key,
         base_url="https://api.deepseek.com",
+        max_retries=DEEPSEEK_MAX_RETRIES,
     )
     return client
 
 
-def score_item_with_deepseek(client: OpenAI, user_profile: str, item: dict) -> float:
+def score_item_with_deepseek(client: "OpenAI", user_profile: str, item: dict) -> Optional[float]:
     """
     给单条学术文章打“兴趣/相关性分”（0-100），使用 DeepSeek。
-    只返回一个数字；解析失败时返回 0。
+    只返回一个数字；解析失败时返回 0；请求失败时返回 None（不写入缓存）。
     """
-    title = item.get("title", "") or ""
-    summary = item.get("summary", "") or ""
-    feed_name = item.get("feed_name", "") or ""
-    link = item.get("link", "") or ""
-    # 新增：尝试读取 doi / DOI 字段
-    doi = item.get("doi", "") or item.get("DOI", "") or ""
+    title = item.get("title", "")
+    summary = item.get("summary", "")
+    feed_name = item.get("feed_name", "")
+    link = item.get("link", "")
+    doi = item.get("doi", "")
 
     content_snippet = summary if summary.strip() else title
 
@@ -230,20 +417,90 @@ def score_item_with_deepseek(client: OpenAI, user_profile: str, item: dict) -> f
             stream=False,
         )
         content = resp.choices[0].message.content.strip()
-        digits = re.findall(r"\d+", content)
-        if not digits:
-            return 0.0
-        score = float(digits[0])
+        # 只需要第一个整数，search 找到即停
+        m = _DIGITS_RE.search(content)
+        score = float(m.group()) if m else 0.0
         return max(0.0, min(100.0, score))
     except Exception as e:
         print(f"[DeepSeek 错误] 打分失败: {e}")
-        return 0.0
+        return None
 
 
-def translate_text_to_zh(client: OpenAI, text: str) -> str:
+def score_items_batch(client: "OpenAI", user_profile: str, items: list) -> list:
+    """
+    一次请求给多条学术文章打分，让 DeepSeek 返回一个 JSON 整数数组。
+    返回与 items 等长的分数列表；请求失败的位置为 None。
+    回复解析失败（不是数组 / 长度不符）时，退回逐条打分。
+    """
+    if len(items) == 1:
+        return [score_item_with_deepseek(client, user_profile, items[0])]
+
+    blocks = []
+    for i, item in enumerate(items, start=1):
+        title = item.get("title", "")
+        summary = item.get("summary", "")
+        feed_name = item.get("feed_name", "")
+        link = item.get("link", "")
+        doi = item.get("doi", "")
+        content_snippet = summary if summary.strip() else title
+        blocks.append(
+            f"文章 {i}:\n"
+            f"- 期刊 / 来源: {feed_name}\n"
+            f"- 标题: {title}\n"
+            f"- 摘要或简介: {content_snippet}\n"
+            f"- 链接: {link}\n"
+            f"- DOI: {doi}"
+        )
+    articles = "\n\n".join(blocks)
+
+    prompt = f"""
+你是一个学术文献推荐助手，请严格按照下面要求打分：
+
+[研究者画像]
+{user_profile}
+
+[学术文章列表（共 {len(items)} 篇）]
+{articles}
+
+任务：从“与研究者当前研究兴趣的相关性”角度，
+按顺序给每篇文章一个 0-100 的分数：
+- 0 分：几乎完全不相关
+- 50 分：有点关系，可以顺手看看
+- 80 分以上：高度相关，值得重点关注和阅读
+
+**非常重要：你的回复只能是一个 JSON 整数数组，长度必须为 {len(items)}，顺序与文章编号一致，例如 [87, 12, 43]，不要带任何解释和其他内容。**
+"""
+
+    try:
+        resp = client.chat.completions.create(
+            model="deepseek-chat",
+            messages=[
+                {"role": "system", "content": "你是一个只返回 JSON 数字数组的学术推荐系统，不要输出解释。"},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.15,
+            stream=False,
+        )
+        content = (resp.choices[0].message.content or "").strip()
+    except Exception as e:
+        print(f"[DeepSeek 错误] 批量打分失败: {e}")
+        return [None] * len(items)
+
+    try:
+        match = _JSON_ARRAY_RE.search(content)
+        scores = json.loads(match.group()) if match else None
+        if not isinstance(scores, list) or len(scores) != len(items):
+            raise ValueError(f"期望 {len(items)} 个分数，实际回复：{content[:80]}")
+        return [max(0.0, min(100.0, float(x))) for x in scores]
+    except (ValueError, TypeError) as e:
+        print(f"[DeepSeek 警告] 批量打分结果解析失败，改为逐条打分: {e}")
+        return [score_item_with_deepseek(client, user_profile, item) for item in items]
+
+
+def translate_text_to_zh(client: "OpenAI", text: str) -> Optional[str]:
     """
     用 DeepSeek 把英文/其他语言的学术文本翻译成简体中文。
-    翻译失败时返回原文。
+    翻译失败时返回 None。
     """
     text = (text or "").strip()
     if not text:
@@ -268,13 +525,106 @@ def translate_text_to_zh(client: OpenAI, text: str) -> str:
         return (resp.choices[0].message.content or "").strip()
     except Exception as e:
         print(f"[DeepSeek 错误] 翻译失败: {e}")
-        return text
+        return None
+
+
+def translate_texts_to_zh(client: "OpenAI", texts: list, max_workers: int = 20) -> dict:
+    """
+    批量翻译：去重后先查本地缓存，其余文本并发调用 translate_text_to_zh。
+    返回 {原文: 译文}；翻译失败的文本译文即为原文（且不写入缓存）。
+    """
+    texts = [t for t in dict.fromkeys(texts) if t and t.strip()]
+    if not texts:
+        return {}
+
+    keys = {t: _hash_key(t) for t in texts}
+    cache = open_cache()
+    cached = cache_get(cache, "translations", list(keys.values())) if cache is not None else {}
+
+    result = {t: cached[k] for t, k in keys.items() if k in cached}
+    todo = [t for t in texts if t not in result]
+
+    to_save = {}
+    if todo:
+        print(f"[信息] 正在使用 DeepSeek 并发翻译 {len(todo)} 段文本（另有 {len(result)} 段命中翻译缓存）...")
+
+        def _translate(text):
+            return translate_text_to_zh(client, text)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            translated = list(executor.map(_translate, todo))
+
+        for text, zh in zip(todo, translated):
+            if zh is None:
+                result[text] = text
+                continue
+            result[text] = zh
+            to_save[keys[text]] = zh
+
+    if cache is not None:
+        with closing(cache):
+            cache_put(cache, "translations", to_save)
+
+    return result
 
 
 # =======================
 #   DeepSeek 个性化推荐
 # =======================
 
+def _compile_keywords(words) -> Optional[re.Pattern]:
+    """
+    把关键词列表编译成一个不区分大小写的正则；列表为空时返回 None。
+    按整词匹配：关键词前后不能紧挨英文字母 / 数字 / 下划线，
+    所以 "AI" 不会命中 "domain"、"Spain"；中文关键词仍按子串匹配。
+    """
+    words = [str(w).strip() for w in (words or []) if str(w).strip()]
+    if not words:
+        return None
+    alternation = "|".join(map(re.escape, words))
+    return re.compile(rf"(?<![A-Za-z0-9_])(?:{alternation})(?![A-Za-z0-9_])", re.I)
+
+
+def prefilter_scores(candidates: pd.DataFrame, personalization: dict) -> np.ndarray:
+    """
+    调用 DeepSeek 之前先按关键词粗筛，返回与 candidates 等长的分数数组：
+    - 标题 / 摘要命中 personalization.blocklist → 0 分
+    - 标题 / 摘要 / 期刊名命中 personalization.whitelist → 100 分
+    - 设置了 personalization.keywords，但标题 / 摘要一个都没命中 → 0 分
+    - 其余为 NaN，交给 DeepSeek 打分
+    三个列表都为空时不做任何粗筛。
+    """
+    scores = np.full(len(candidates), np.nan)
+
+    def _text(*cols) -> pd.Series:
+        parts = [
+            candidates[c].astype("string").fillna("") if c in candidates.columns
+            else pd.Series("", index=candidates.index, dtype="string")
+            for c in cols
+        ]
+        text = parts[0]
+        for part in parts[1:]:
+            text = text + " " + part
+        return text
+
+    content = _text("title", "summary")
+
+    keywords = _compile_keywords(personalization.get("keywords"))
+    if keywords is not None:
+        scores[~content.str.contains(keywords).to_numpy(dtype=bool)] = 0.0
+
+    whitelist = _compile_keywords(personalization.get("whitelist"))
+    if whitelist is not None:
+        hit = _text("title", "summary", "feed_name").str.contains(whitelist)
+        scores[hit.to_numpy(dtype=bool)] = 100.0
+
+    blocklist = _compile_keywords(personalization.get("blocklist"))
+    if blocklist is not None:
+        scores[content.str.contains(blocklist).to_numpy(dtype=bool)] = 0.0
+
+    return scores
+
+
 def personalized_recommendations(recent_df: pd.DataFrame, settings: dict) -> Optional[pd.DataFrame]:
     """
     对“新增”的学术条目做个性化打分，返回 Top N 的 DataFrame。
@@ -298,31 +648,82 @@ def personalized_recommendations(recent_df: pd.DataFrame, settings: dict) -> Opt
     max_candidates = int(personalization.get("max_candidates", 80))
     top_n = int(personalization.get("top_n", 10))
     max_workers = int(personalization.get("max_workers", 20))
+    batch_size = max(1, int(personalization.get("batch_size", 10)))
 
     if recent_df.empty:
         print("[提示] recent_df 为空，没有可以做个性化推荐的学术条目。")
         return None
 
-    # 按时间排序，最新在前
-    tmp = recent_df.copy()
-    for col in ["published", "fetched_at"]:
-        if col in tmp.columns:
-            tmp[col] = pd.to_datetime(tmp[col], errors="coerce", utc=True)
-    ts = tmp["published"].fillna(tmp["fetched_at"])
-    tmp = tmp.assign(_ts=ts).sort_values("_ts", ascending=False)
-
-    # 取前 max_candidates 条作为候选
-    candidates = tmp.head(max_candidates).copy()
-
-    print(f"[信息] 正在使用 DeepSeek 并发为最近 {len(candidates)} 条学术条目打相关性分（max_workers={max_workers}）...")
+    # 每条的时间：published 缺失时用 fetched_at 兜底（NaT 视为最旧）
+    published = pd.to_datetime(recent_df["published"], errors="coerce", utc=True)
+    fetched_at = pd.to_datetime(recent_df["fetched_at"], errors="coerce", utc=True)
+    # 统一到微秒精度再比较；不能强转 ns，否则超出 ns 范围的日期会溢出
+    pub = published.dt.tz_localize(None).dt.as_unit("us").to_numpy()
+    fch = fetched_at.dt.tz_localize(None).dt.as_unit("us").to_numpy()
+    ts = np.where(np.isnat(pub), fch, pub).view("i8")
+
+    # 取最新的 max_candidates 条作为候选：argpartition 选出 top-k（O(N)），
+    # 再只对这 k 条按时间倒序排列，不必对全部条目排序
+    k = min(max_candidates, len(ts))
+    if 0 < k < len(ts):
+        idx = np.argpartition(ts, len(ts) - k)[len(ts) - k:]
+    else:
+        idx = np.arange(max(k, 0))
+    idx = idx[np.argsort(ts[idx], kind="stable")[::-1]]
+    # 只给选中的候选行换上解析后的时间，不复制整个 recent_df
+    candidates = recent_df.iloc[idx].assign(
+        published=published.iloc[idx].array,
+        fetched_at=fetched_at.iloc[idx].array,
+    )
 
     items = list(candidates.to_dict(orient="records"))
-
-    def _score(item_dict):
-        return score_item_with_deepseek(client, user_profile, item_dict)
-
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        scores = list(executor.map(_score, items))
+    keys = [score_cache_key(user_profile, it) for it in items]
+
+    # 关键词粗筛：明显无关 / 必看的条目直接给分，不调用 DeepSeek
+    pre = prefilter_scores(candidates, personalization)
+    undecided = [i for i in range(len(items)) if np.isnan(pre[i])]
+    if len(undecided) < len(items):
+        print(f"[信息] 关键词粗筛直接判定了 {len(items) - len(undecided)} 条学术条目，无需调用 DeepSeek。")
+
+    # 再查本地缓存：已见列表按 feed_id||link 去重，同一标题 + 摘要换了链接或 feed 再次出现时才会命中
+    cache = open_cache()
+    cached = cache_get(cache, "scores", [keys[i] for i in undecided]) if cache is not None else {}
+    todo = [i for i in undecided if keys[i] not in cached]
+
+    if cache is not None and undecided:
+        print(f"[信息] 其余 {len(undecided)} 条学术条目中有 {len(undecided) - len(todo)} 条命中打分缓存。")
+
+    # 每 batch_size 条合成一次请求，批与批之间并发
+    todo_items = [items[i] for i in todo]
+    batches = [todo_items[i:i + batch_size] for i in range(0, len(todo_items), batch_size)]
+
+    def _score_batch(batch):
+        return score_items_batch(client, user_profile, batch)
+
+    fresh = []
+    if batches:
+        print(
+            f"[信息] 正在使用 DeepSeek 并发为其余 {len(todo)} 条学术条目打相关性分"
+            f"（{len(batches)} 批，batch_size={batch_size}，max_workers={max_workers}）..."
+        )
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch_scores in executor.map(_score_batch, batches):
+                fresh.extend(batch_scores)
+
+    scores = [
+        cached.get(k, 0.0) if np.isnan(p) else float(p)
+        for k, p in zip(keys, pre)
+    ]
+    to_save = {}
+    for i, score in zip(todo, fresh):
+        if score is None:
+            continue
+        scores[i] = score
+        to_save[keys[i]] = score
+
+    if cache is not None:
+        with closing(cache):
+            cache_put(cache, "scores", to_save)
 
     candidates = candidates.assign(_personal_score=scores)
     ranked = candidates.sort_values("_personal_score", ascending=False).head(top_n)
@@ -334,10 +735,43 @@ def personalized_recommendations(recent_df: pd.DataFrame, settings: dict) -> Opt
 # 报告生成 & 保存为 txt（含中英翻译 + DOI）
 # ======================
 
-def generate_and_save_report(personalized: pd.DataFrame, now: datetime) -> str:
+# 报告用到的列，顺序与 _render_item 的位置参数一致
+REPORT_COLUMNS = ["title", "feed_name", "link", "_personal_score", "published", "summary", "doi"]
+
+
+def _render_item(title, feed_name, link, score, published, summary, doi, translations: dict) -> str:
+    """
+    把一条推荐结果渲染成报告里的一段文本（以空行结尾）。
+    translations 为 {原文: 译文}，没有译文时只输出原文。
+    """
+    doi = str(doi).strip()
+    title_zh = translations.get(title, "") if title else ""
+    summary_zh = translations.get(summary, "") if summary else ""
+
+    lines = [f"- [{feed_name}] ({int(score)} 分)"]
+    if pd.notna(published) and str(published).strip():
+        lines.append(f"    时间: {published}")
+    lines.append(f"    标题: {title}")
+    if title_zh:
+        lines.append(f"    标题: {title_zh}")
+    if summary:
+        lines.append(f"    摘要: {summary}")
+    if summary_zh:
+        lines.append(f"    摘要: {summary_zh}")
+    if doi:
+        lines.append(f"    DOI: {doi}")
+        # 如果不是完整链接，就顺手生成一个 doi.org 的链接
+        if not doi.lower().startswith("http"):
+            lines.append(f"    DOI链接: https://doi.org/{doi}")
+    lines.append(f"    链接: {link}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def generate_and_save_report(personalized: pd.DataFrame, now: datetime, max_workers: int = 20) -> str:
     """
     把推荐结果打印到终端，同时保存到 data/reports/academic_YYYY-MM-DD.txt。
-    会尝试用 DeepSeek 把标题和摘要翻译成中文一起写进去。
+    会尝试用 DeepSeek 把标题和摘要翻译成中文一起写进去（并发 + 本地缓存）。
     同时输出 DOI 和 DOI 链接，方便下载。
     返回 txt 文件路径。
     """
@@ -347,74 +781,30 @@ def generate_and_save_report(personalized: pd.DataFrame, now: datetime) -> str:
 
     # 尝试拿一个 DeepSeek client 用来翻译；没有就只输出英文
     client = get_deepseek_client()
-
-    lines = []
-    lines.append("学术期刊监控日报（Academic Journal Watcher）")
-    lines.append(f"生成时间：{now.strftime('%Y-%m-%d %H:%M')}")
-    lines.append("")
-    lines.append("【个性化推荐】根据你的研究兴趣挑出的最新学术文章：")
-    lines.append("")
-
-    print("【个性化推荐】根据你的研究兴趣挑出的最新学术文章：\n")
-
-    for _, row in personalized.iterrows():
-        title = row.get("title", "") or ""
-        feed_name = row.get("feed_name", "") or ""
-        link = row.get("link", "") or ""
-        score = row.get("_personal_score", 0)
-        published = row.get("published", "")
-        summary = row.get("summary", "") or ""
-        # 新增：尝试读取 doi / DOI 字段
-        doi = row.get("doi", "") or row.get("DOI", "") or ""
-        doi = str(doi).strip()
-
-        # 如果有 DeepSeek client，就翻译标题和摘要
-        if client is not None:
-            title_zh = translate_text_to_zh(client, title) if title else ""
-            summary_zh = translate_text_to_zh(client, summary) if summary else ""
-        else:
-            title_zh = ""
-            summary_zh = ""
-
-        # ===== 打印到终端 =====
-        print(f"- [{feed_name}] ({int(score)} 分)")
-        if published is not None and str(published).strip():
-            print(f"    时间: {published}")
-        print(f"    标题: {title}")
-        if title_zh:
-            print(f"    标题: {title_zh}")
-        if summary:
-            print(f"    摘要: {summary}")
-        if summary_zh:
-            print(f"    摘要: {summary_zh}")
-        if doi:
-            print(f"    DOI: {doi}")
-            # 如果不是完整链接，就顺手生成一个 doi.org 的链接
-            if not doi.lower().startswith("http"):
-                print(f"    DOI链接: https://doi.org/{doi}")
-        print(f"    链接: {link}")
-        print()
-
-        # ===== 写入 txt 文本 =====
-        lines.append(f"- [{feed_name}] ({int(score)} 分)")
-        if published is not None and str(published).strip():
-            lines.append(f"    时间: {published}")
-        lines.append(f"    标题: {title}")
-        if title_zh:
-            lines.append(f"    标题: {title_zh}")
-        if summary:
-            lines.append(f"    摘要: {summary}")
-        if summary_zh:
-            lines.append(f"    摘要: {summary_zh}")
-        if doi:
-            lines.append(f"    DOI: {doi}")
-            if not doi.lower().startswith("http"):
-                lines.append(f"    DOI链接: https://doi.org/{doi}")
-        lines.append(f"    链接: {link}")
-        lines.append("")
-
+    translations = {}
+    if client is not None:
+        texts = []
+        for col in ["title", "summary"]:
+            if col in personalized.columns:
+                texts.extend(personalized[col].dropna().astype(str))
+        translations = translate_texts_to_zh(client, texts, max_workers=max_workers)
+
+    # 每条推荐渲染成一段文本，终端和 txt 共用同一份内容
+    blocks = [
+        _render_item(*row, translations)
+        for row in personalized[REPORT_COLUMNS].itertuples(index=False, name=None)
+    ]
+    body = "\n".join(["【个性化推荐】根据你的研究兴趣挑出的最新学术文章：", ""] + blocks)
+    header = "\n".join([
+        "学术期刊监控日报（Academic Journal Watcher）",
+        f"生成时间：{now.strftime('%Y-%m-%d %H:%M')}",
+        "",
+        "",
+    ])
+
+    print(body)
     with open(txt_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(lines))
+        f.write(header + body)
 
     print(f"[信息] 已将学术推荐日报保存到：{txt_path}")
     return txt_path
@@ -459,7 +849,8 @@ def main():
         return
 
     # 4. 生成 txt 日报
-    generate_and_save_report(personalized, now)
+    max_workers = int(settings.get("personalization", {}).get("max_workers", 20))
+    generate_and_save_report(personalized, now, max_workers=max_workers)
     print("结束。")
 
 
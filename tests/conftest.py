@@ -0,0 +1,6 @@
+# tests/conftest.py
+import os
+import sys
+
+# 脚本都在仓库根目录，不是包；让测试能直接 import daily_academic_report
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
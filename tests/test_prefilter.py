@@ -0,0 +1,30 @@
+# tests/test_prefilter.py
+import numpy as np
+import pandas as pd
+
+from daily_academic_report import _compile_keywords, prefilter_scores
+
+
+def test_keywords_match_whole_words_only():
+    pattern = _compile_keywords(["AI"])
+    assert pattern.search("Generative AI and platform governance")
+    assert pattern.search("ai-driven moderation")
+    for text in ["domain", "again", "Spain", "said"]:
+        assert not pattern.search(text), text
+
+
+def test_chinese_keywords_still_match_as_substrings():
+    pattern = _compile_keywords(["隐私"])
+    assert pattern.search("数字平台中的隐私与监控")
+
+
+def test_prefilter_uses_word_boundaries():
+    candidates = pd.DataFrame({
+        "title": ["AI ethics audit", "Migration in Spain", "Erratum"],
+        "summary": ["", "domain knowledge", ""],
+        "feed_name": ["A", "B", "C"],
+    })
+    scores = prefilter_scores(candidates, {"whitelist": ["AI"], "blocklist": ["erratum"]})
+    assert scores[0] == 100.0
+    assert np.isnan(scores[1])
+    assert scores[2] == 0.0